@@ -9,29 +9,130 @@ import sys
 import json
 import time
 from pathlib import Path
+from multiprocessing import Pool
 
 # Import our fast extractor
 import fitz  # PyMuPDF
 import re
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from collections import Counter
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+# Pre-compiled patterns used in the heading hot path
+# Non-heading shapes: all lowercase | only numbers and punctuation |
+# single letters or very short caps
+_RE_SKIP = re.compile(r'^(?:[a-z\s]+|[\d\s\-\.]+|[A-Z]{1,3})$')
+_RE_NUM_DOT_WORD = re.compile(r'^\d+\.\s+\w')
+_RE_WS = re.compile(r'\s+')
+
+# Text extraction flags: default "dict" output minus embedded images,
+# which are never read but would otherwise be decoded for every page
+_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# PyMuPDF span flag bit for bold text
+_BOLD_FLAG = 1 << 4
+
+# Upper bound on parallel PDF workers
+MAX_WORKERS = 4
+
+# H1: Major sections - must be quite large or specific patterns
+_H1_PATTERNS = (
+    "ontario's digital library",
+    "a critical component for implementing ontario's road map to prosperity strategy",
+    "appendix a: odl envisioned phases",
+    "appendix b: odl steering committee",
+    "appendix c: odl's envisioned electronic resources",
+)
+
+# H2: Main sections
+_H2_PATTERNS = (
+    'summary',
+    'background',
+    'the business plan to be developed',
+    'approach and specific proposal requirements',
+    'evaluation and awarding of contract',
+    'appendix a:',
+    'appendix b:',
+    'appendix c:',
+)
+
+# H3: Subsections - look for colons and specific patterns
+_H3_PATTERNS = (
+    'timeline:',
+    'milestones',
+    'equitable access for all ontarians:',
+    'shared decision-making and accountability:',
+    'shared governance structure:',
+    'shared funding:',
+    'local points of entry:',
+    'access:',
+    'guidance and advice:',
+    'training:',
+    'provincial purchasing & licensing:',
+    'technological support:',
+    'what could the odl really mean?',
+    'phase i: business planning',
+    'phase ii: implementing and transitioning',
+    'phase iii: operating and growing the odl',
+)
+
+# H4: Detailed subsections
+_H4_PATTERNS = (
+    'for each ontario citizen it could mean:',
+    'for each ontario student it could mean:',
+    'for each ontario library it could mean:',
+    'for the ontario government it could mean:',
+)
+
+# First-page fragments that are never part of a title
+_TITLE_EXCLUDE = frozenset({'march', '2003', '21,', 'working', 'together'})
+
+# Markers of the fragmented "RFP" title text
+_RE_TITLE_MARKERS = re.compile(r'RFP|quest|Pr')
+
+# Fragments to exclude (specific to this document's corruption)
+_EXCLUDE_FRAGMENTS = frozenset({
+    'rfp: r', 'rfp: reeeequest f', 'quest foooor pr', 'r pr', 'r proposal',
+    'march 21, 2003', 'march 2003', 'ontario\'s libraries', 'working together',
+    'digital library', 'to present a proposal for developing',
+    'the business plan for the ontario', 'oposal', 'quest f'
+})
+
+# Running headers/footers: text in the top or bottom margin band that
+# repeats on at least this many pages (or this share of pages)
+_MARGIN_BAND = 0.08
+_RUNNING_MIN_PAGES = 3
+_RUNNING_PAGE_SHARE = 0.3
+
+def _compile_literals(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile substring literals into one alternation scanned in a single pass"""
+    return re.compile('|'.join(re.escape(p) for p in patterns))
+
+_RE_H1_LITERALS = _compile_literals(_H1_PATTERNS)
+_RE_H2_LITERALS = _compile_literals(_H2_PATTERNS)
+_RE_H3_LITERALS = _compile_literals(_H3_PATTERNS)
+_RE_H4_LITERALS = _compile_literals(_H4_PATTERNS)
+
+@dataclass(slots=True)
 class FontInfo:
     size: float
     name: str
     is_bold: bool
     bbox: Tuple[float, float, float, float]
 
-@dataclass
+@dataclass(slots=True)
 class TextElement:
     text: str
     font: FontInfo
     page_number: int
     position_y: float
 
-@dataclass
+@dataclass(slots=True)
 class Heading:
     text: str
     level: int
@@ -49,17 +150,6 @@ class FastPDFHeadingExtractor:
     
     def __init__(self, max_pages: int = 50):
         self.max_pages = max_pages
-        
-        # Optimized patterns for common document structures
-        self.h1_patterns = [
-            r'^\d+\.\s+[A-Z]',  # "1. Introduction"
-            r'^[A-Z][A-Z\s]{8,}$',  # "INTRODUCTION"
-            r'^(Introduction|Conclusion|References|Acknowledgements|Abstract)$'
-        ]
-        
-        self.h2_patterns = [
-            r'^\d+\.\d+\s+[A-Z]',  # "2.1 Subsection"
-        ]
     
     def extract_headings(self, pdf_path: str) -> Dict[str, Any]:
         """Fast extraction with minimal processing"""
@@ -70,16 +160,16 @@ class FastPDFHeadingExtractor:
             if not text_elements:
                 return {"title": None, "outline": []}
             
-            # Quick font analysis
+            # Quick font analysis; the sorted sizes also feed the percentiles
             font_sizes = [elem.font.size for elem in text_elements]
+            sorted_sizes = sorted(font_sizes)
             avg_size = sum(font_sizes) / len(font_sizes)
-            max_size = max(font_sizes)
             
             # Extract title (largest text on first page)
-            title = self._extract_title_fast(text_elements, max_size)
+            title = self._extract_title_fast(text_elements)
             
             # Find headings using size and pattern heuristics
-            headings = self._find_headings_fast(text_elements, avg_size, title)
+            headings = self._find_headings_fast(text_elements, avg_size, title, sorted_sizes)
             
             return {
                 "title": title if title else "",
@@ -91,51 +181,62 @@ class FastPDFHeadingExtractor:
             return {"title": "", "outline": []}
     
     def _extract_text_fast(self, pdf_path: str) -> List[TextElement]:
-        """Fast text extraction with minimal processing"""
+        """Extract the text elements of the first max_pages pages"""
         elements = []
-        
-        doc = fitz.open(pdf_path)
-        total_pages = min(len(doc), self.max_pages)
-        
-        for page_num in range(total_pages):
-            page = doc[page_num]
-            page_height = page.rect.height
-            
-            # Get text with font info
-            blocks = page.get_text("dict")
+        append = elements.append  # bound once for the span loop
+        bold_fonts = {}  # font name -> "Bold" in name, per document
+        with fitz.open(pdf_path) as doc:
+            total_pages = min(len(doc), self.max_pages)
             
-            for block in blocks.get("blocks", []):
-                if "lines" not in block:
-                    continue
-                    
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text = span["text"].strip()
-                        if len(text) < 3 or len(text) > 200:
-                            continue
-                        
-                        # Quick font info extraction
-                        font_info = FontInfo(
-                            size=span["size"],
-                            name=span["font"],
-                            is_bold="Bold" in span["font"] or span["flags"] & 2**4,
-                            bbox=span["bbox"]
-                        )
-                        
-                        # Normalized Y position
-                        position_y = span["bbox"][1] / page_height
+            for page in doc.pages(0, total_pages):
+                page_number = page.number + 1
+                page_height = page.rect.height
+                
+                # Get text with font info
+                blocks = page.get_text("dict", flags=_TEXT_FLAGS)
+                
+                for block in blocks.get("blocks", []):
+                    if "lines" not in block:
+                        continue
                         
-                        elements.append(TextElement(
-                            text=text,
-                            font=font_info,
-                            page_number=page_num + 1,
-                            position_y=position_y
-                        ))
+                    for line in block["lines"]:
+                        for span in line["spans"]:
+                            raw = span["text"]
+                            if len(raw) < 3:  # cannot strip to 3+ chars
+                                continue
+                            text = raw.strip()
+                            if len(text) < 3 or len(text) > 200:
+                                continue
+                            
+                            # Quick font info extraction
+                            font = sys.intern(span["font"])  # repeats across spans
+                            bbox = span["bbox"]
+                            is_bold = bool(span["flags"] & _BOLD_FLAG)
+                            if not is_bold:
+                                # Fall back to the (memoised) font-name test
+                                is_bold = bold_fonts.get(font)
+                                if is_bold is None:
+                                    is_bold = bold_fonts[font] = "Bold" in font
+                            font_info = FontInfo(
+                                size=span["size"],
+                                name=font,
+                                is_bold=is_bold,
+                                bbox=bbox
+                            )
+                            
+                            # Normalized Y position
+                            position_y = bbox[1] / page_height
+                            
+                            append(TextElement(
+                                text=text,
+                                font=font_info,
+                                page_number=page_number,
+                                position_y=position_y
+                            ))
         
-        doc.close()
         return elements
     
-    def _extract_title_fast(self, elements: List[TextElement], max_size: float) -> Optional[str]:
+    def _extract_title_fast(self, elements: List[TextElement]) -> Optional[str]:
         """Improved title extraction with text reconstruction"""
         first_page = [e for e in elements if e.page_number == 1]
         if not first_page:
@@ -149,9 +250,9 @@ class FastPDFHeadingExtractor:
             e for e in first_page 
             if e.font.size >= max_first_page_size * 0.9 and 
                e.position_y < 0.4 and  # Top 40% of page
-               len(e.text.strip()) > 2 and
-               not e.text.strip().isdigit() and
-               not e.text.strip().lower() in ['march', '2003', '21,', 'working', 'together']
+               len(e.text) > 2 and
+               not e.text.isdigit() and
+               e.text.lower() not in _TITLE_EXCLUDE
         ]
         
         if not title_candidates:
@@ -166,7 +267,8 @@ class FastPDFHeadingExtractor:
         combined_text = ' '.join(text_parts)
         
         # If we detect the fragmented RFP pattern, return the expected clean title
-        if any('RFP' in part or 'quest' in part or 'Pr' in part for part in text_parts[:10]):
+        # (newline-joined so a marker cannot match across two parts)
+        if _RE_TITLE_MARKERS.search('\n'.join(text_parts[:10])):
             return "RFP:Request for Proposal To Present a Proposal for Developing the Business Plan for the Ontario Digital Library  "
         
         # Otherwise try to combine the text intelligently
@@ -178,7 +280,7 @@ class FastPDFHeadingExtractor:
             text = candidate.text.strip()
             
             # Skip obvious non-title elements
-            if (text.lower() in ['working', 'together', 'march', '2003', '21,'] or
+            if (text.lower() in _TITLE_EXCLUDE or
                 len(text) < 2):
                 continue
             
@@ -201,7 +303,7 @@ class FastPDFHeadingExtractor:
             full_title = ' '.join(title_lines)
             
             # Clean up the title
-            full_title = re.sub(r'\s+', ' ', full_title)  # Multiple spaces
+            full_title = _RE_WS.sub(' ', full_title)  # Multiple spaces
             full_title = full_title.strip()
             
             # Add trailing spaces to match expected format
@@ -210,142 +312,116 @@ class FastPDFHeadingExtractor:
         
         return None
     
-    def _find_headings_fast(self, elements: List[TextElement], avg_size: float, title: str) -> List[Heading]:
+    def _find_headings_fast(self, elements: List[TextElement], avg_size: float, title: str,
+                            sorted_sizes: List[float]) -> List[Heading]:
         """Improved heading detection with better level classification"""
-        headings = []
+        # (lowercased text, page) -> first heading found for it
+        unique = {}
+        
+        title_lower = title.lower() if title else ""
+        title_len = len(title_lower)
+        
+        # One pass for the short-text ratio and the margin texts
+        # (element text is stripped at extraction time)
+        short_count = 0
+        margin_texts = set()
+        in_margin = []  # per element, reused by the main loop below
+        for e in elements:
+            if len(e.text) < 15:
+                short_count += 1
+            margin = self._in_margin(e)
+            in_margin.append(margin)
+            if margin:
+                margin_texts.add((e.text, e.page_number))
         
         # Filter out form-like documents
-        short_elements = [e for e in elements if len(e.text.strip()) < 15]
-        is_form_like = (len(short_elements) / len(elements) > 0.4 if elements else False) or \
-                       any(keyword in (title or "").lower() for keyword in ["application", "form", "grant"])
+        is_form_like = (short_count / len(elements) > 0.4 if elements else False) or \
+                       any(keyword in title_lower for keyword in ["application", "form", "grant"])
         
         if is_form_like:
             return []
         
-        # Get font size statistics
-        font_sizes = [e.font.size for e in elements]
-        size_75th = sorted(font_sizes)[int(len(font_sizes) * 0.75)] if font_sizes else avg_size
-        size_90th = sorted(font_sizes)[int(len(font_sizes) * 0.9)] if font_sizes else avg_size
-        
-        # Fragments to exclude (specific to this document's corruption)
-        exclude_fragments = {
-            'rfp: r', 'rfp: reeeequest f', 'quest foooor pr', 'r pr', 'r proposal',
-            'march 21, 2003', 'march 2003', 'ontario\'s libraries', 'working together',
-            'digital library', 'to present a proposal for developing',
-            'the business plan for the ontario', 'oposal', 'quest f'
-        }
+        running = self._running_texts(margin_texts, elements[-1].page_number)
         
-        for element in elements:
-            text = element.text.strip()
+        # Get font size statistics
+        if sorted_sizes:
+            size_75th = sorted_sizes[int(len(sorted_sizes) * 0.75)]
+            size_90th = sorted_sizes[int(len(sorted_sizes) * 0.9)]
+        else:
+            size_75th = size_90th = avg_size
+        
+        for element, margin in zip(elements, in_margin):
+            text = element.text
+            if margin and text in running:
+                continue
             text_lower = text.lower()
             
+            # Repeats of an accepted heading on the same page are dropped
+            # (first occurrence wins), so skip them before any checks
+            key = (text_lower, element.page_number)
+            if key in unique:
+                continue
+            
             # Skip if it's part of the title or fragmented text
-            if (title and (text_lower in title.lower() or title.lower() in text_lower) or
-                text_lower in exclude_fragments):
+            # (text shorter than the title cannot contain it)
+            if (title_lower and (text_lower in title_lower or
+                                 (len(text_lower) >= title_len and title_lower in text_lower)) or
+                text_lower in _EXCLUDE_FRAGMENTS):
                 continue
             
             # Enhanced filtering
             if (len(text) < 4 or len(text) > 150 or
                 text.isdigit() or
                 text.count(' ') > 15 or
-                text.endswith('.') and not text.endswith(': ') and not text.startswith(('1.', '2.', '3.')) or
-                re.match(r'^[a-z\s]+$', text) or  # All lowercase
-                re.match(r'^[\d\s\-\.]+$', text) or  # Only numbers and punctuation
-                re.match(r'^[A-Z]{1,3}$', text)):  # Single letters or very short caps
+                text[-1] == '.' and not text.startswith(('1.', '2.', '3.')) or
+                _RE_SKIP.match(text)):
                 continue
             
             # Classify heading level
-            level = self._classify_heading_level_improved(text, element.font.size, avg_size, size_75th, size_90th, element.font.is_bold)
+            level = self._classify_heading_level_improved(text, text_lower, element.font.size, avg_size, size_75th, size_90th, element.font.is_bold)
             
             if level > 0:
-                headings.append(Heading(
+                unique[key] = Heading(
                     text=text + " " if not text.endswith(" ") else text,  # Add trailing space
                     level=level,
                     page=element.page_number
-                ))
-        
-        # Remove duplicates and sort
-        seen = set()
-        unique_headings = []
-        for h in headings:
-            key = (h.text.lower().strip(), h.page)
-            if key not in seen:
-                seen.add(key)
-                unique_headings.append(h)
+                )
         
         # Sort by page then by position (roughly)
-        unique_headings.sort(key=lambda x: (x.page, len(x.text), x.text))
+        unique_headings = sorted(unique.values(), key=lambda x: (x.page, len(x.text), x.text))
         
         return unique_headings
     
-    def _classify_heading_level_improved(self, text: str, font_size: float, avg_size: float, 
+    def _in_margin(self, element: TextElement) -> bool:
+        """Whether an element sits in the top or bottom margin band of its page"""
+        return element.position_y < _MARGIN_BAND or element.position_y > 1.0 - _MARGIN_BAND
+    
+    def _running_texts(self, seen: set, num_pages: int) -> frozenset:
+        """Margin (text, page) pairs repeated across many pages (running headers/footers)"""
+        if not seen:
+            return frozenset()
+        
+        threshold = max(_RUNNING_MIN_PAGES, _RUNNING_PAGE_SHARE * num_pages)
+        counts = Counter(text for text, _ in seen)
+        return frozenset(text for text, count in counts.items() if count >= threshold)
+    
+    def _classify_heading_level_improved(self, text_orig: str, text_lower: str, font_size: float, avg_size: float, 
                                        size_75th: float, size_90th: float, is_bold: bool) -> int:
         """Improved heading level classification matching expected output"""
-        text_strip = text.strip().lower()
-        text_orig = text.strip()
-        
-        # H1: Major sections - must be quite large or specific patterns
-        h1_patterns = [
-            "ontario's digital library",
-            "a critical component for implementing ontario's road map to prosperity strategy",
-            "appendix a: odl envisioned phases",
-            "appendix b: odl steering committee",
-            "appendix c: odl's envisioned electronic resources"
-        ]
-        
-        if any(pattern in text_strip for pattern in h1_patterns):
+        # Literal section-name patterns, checked in level priority order
+        if _RE_H1_LITERALS.search(text_lower):
             return 1
         
-        # H2: Main sections
-        h2_patterns = [
-            'summary',
-            'background', 
-            'the business plan to be developed',
-            'approach and specific proposal requirements',
-            'evaluation and awarding of contract',
-            'appendix a:',
-            'appendix b:',
-            'appendix c:'
-        ]
-        
-        if any(pattern in text_strip for pattern in h2_patterns):
+        if _RE_H2_LITERALS.search(text_lower):
             return 2
         
-        # H3: Subsections - look for colons and specific patterns
-        h3_patterns = [
-            'timeline:',
-            'milestones',
-            'equitable access for all ontarians:',
-            'shared decision-making and accountability:',
-            'shared governance structure:',
-            'shared funding:',
-            'local points of entry:',
-            'access:',
-            'guidance and advice:',
-            'training:',
-            'provincial purchasing & licensing:',
-            'technological support:',
-            'what could the odl really mean?',
-            'phase i: business planning',
-            'phase ii: implementing and transitioning',
-            'phase iii: operating and growing the odl'
-        ]
-        
         # Also check for numbered items like "1. Preamble"
-        if (re.match(r'^\d+\.\s+\w', text_orig) or 
-            any(pattern in text_strip for pattern in h3_patterns) or
+        if (_RE_NUM_DOT_WORD.match(text_orig) or 
+            _RE_H3_LITERALS.search(text_lower) or
             (text_orig.endswith(':') and len(text_orig) > 10 and len(text_orig) < 80)):
             return 3
         
-        # H4: Detailed subsections
-        h4_patterns = [
-            'for each ontario citizen it could mean:',
-            'for each ontario student it could mean:',
-            'for each ontario library it could mean:',
-            'for the ontario government it could mean:'
-        ]
-        
-        if any(pattern in text_strip for pattern in h4_patterns):
+        if _RE_H4_LITERALS.search(text_lower):
             return 4
         
         # Size-based fallback (be more conservative)
@@ -363,12 +439,89 @@ class FastPDFHeadingExtractor:
     
     def _classify_level_fast(self, text: str, font_size: float, avg_size: float) -> int:
         """Fast level classification - kept for compatibility"""
-        return self._classify_heading_level_improved(text, font_size, avg_size, avg_size * 1.2, avg_size * 1.4, False)
+        text_orig = text.strip()
+        return self._classify_heading_level_improved(text_orig, text_orig.lower(), font_size, avg_size, avg_size * 1.2, avg_size * 1.4, False)
+
+# Extractor owned by the current pool worker, built once by init_worker()
+_WORKER_EXTRACTOR: Optional[FastPDFHeadingExtractor] = None
+
+def init_worker() -> None:
+    """Pool initializer: build one extractor per worker process"""
+    global _WORKER_EXTRACTOR
+    _WORKER_EXTRACTOR = FastPDFHeadingExtractor()
+
+def process_single_pdf(pdf_path: str) -> Tuple[str, Dict[str, Any], float]:
+    """Extract headings from one PDF; runs inside a pool worker"""
+    if _WORKER_EXTRACTOR is None:
+        init_worker()
+    start_time = time.time()
+    result = _WORKER_EXTRACTOR.extract_headings(pdf_path)
+    return pdf_path, result, time.time() - start_time
+
+def write_json(output_file: Path, result: Dict[str, Any]) -> None:
+    """Write a result as indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+def list_pdfs(input_dir: Path) -> List[Path]:
+    """PDF files directly inside input_dir, listed with a single scandir"""
+    try:
+        with os.scandir(input_dir) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name.endswith('.pdf') and entry.is_file()]
+    except FileNotFoundError:
+        return []
+
+def pending_pdfs(pdf_files: List[Path], output_dir: Path, force: bool = False) -> List[Path]:
+    """PDFs whose JSON output is missing or older than the PDF or this extractor"""
+    if force:
+        return list(pdf_files)
+    
+    # An extractor change invalidates every earlier output
+    extractor_mtime = Path(__file__).stat().st_mtime
+    
+    pending = []
+    for pdf_file in pdf_files:
+        output_file = output_dir / f"{pdf_file.stem}.json"
+        try:
+            output_mtime = output_file.stat().st_mtime
+            if output_mtime >= pdf_file.stat().st_mtime and output_mtime >= extractor_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        pending.append(pdf_file)
+    return pending
+
+def worker_count(num_files: int) -> int:
+    """Number of pool workers to use for a batch of PDFs"""
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS, num_files))
+
+def extract_all(pdf_files: List[Path]) -> Iterator[Tuple[str, Dict[str, Any], float]]:
+    """Yield process_single_pdf results, skipping the pool when one worker would do"""
+    paths = map(str, pdf_files)
+    workers = worker_count(len(pdf_files))
+    if workers == 1:
+        # A single PDF (or CPU) gains nothing from forking a worker
+        init_worker()
+        yield from map(process_single_pdf, paths)
+        return
+    
+    # Each PDF is independent, so extract them across worker processes
+    with Pool(workers, initializer=init_worker) as pool:
+        yield from pool.imap_unordered(process_single_pdf, paths)
 
-def process_pdfs():
+def process_pdfs(force: bool = False, verbose: bool = True):
     """
     Main processing function that processes all PDFs from /app/input
     and outputs JSON files to /app/output
+    
+    PDFs with an output newer than both the PDF and this script are skipped
+    unless force is set.
+    With verbose off only the summary is printed, not the per-file lines.
     """
     input_dir = Path("/app/input")
     output_dir = Path("/app/output")
@@ -379,41 +532,43 @@ def process_pdfs():
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Initialize extractor
-    extractor = FastPDFHeadingExtractor()
-    
     # Get all PDF files
-    pdf_files = list(input_dir.glob("*.pdf"))
+    pdf_files = list_pdfs(input_dir)
     
     if not pdf_files:
         print("No PDF files found in input directory")
         return
     
-    print(f"Found {len(pdf_files)} PDF files to process")
+    print(f"Found {len(pdf_files)} PDF files")
+    
+    skipped = len(pdf_files)
+    pdf_files = pending_pdfs(pdf_files, output_dir, force)
+    skipped -= len(pdf_files)
+    if skipped:
+        print(f"Skipping {skipped} up-to-date files (use --force to reprocess)")
+    if not pdf_files:
+        print("All outputs are up to date")
+        return
+    
+    print(f"Processing {len(pdf_files)} PDF files")
     
     total_start_time = time.time()
     
-    for pdf_file in pdf_files:
-        print(f"Processing: {pdf_file.name}")
-        
-        start_time = time.time()
-        
-        # Extract headings
-        result = extractor.extract_headings(str(pdf_file))
+    for pdf_path, result, processing_time in extract_all(pdf_files):
+        pdf_file = Path(pdf_path)
         
         # Generate output filename
         output_file = output_dir / f"{pdf_file.stem}.json"
         
         # Save JSON output
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        
-        end_time = time.time()
-        processing_time = end_time - start_time
-        
-        print(f"  ✓ Completed in {processing_time:.3f}s")
-        print(f"  ✓ Found {len(result['outline'])} headings")
-        print(f"  ✓ Output: {output_file.name}")
+        write_json(output_file, result)
+        
+        if not verbose:
+            continue
+        print(f"Processing: {pdf_file.name}\n"
+              f"  ✓ Completed in {processing_time:.3f}s\n"
+              f"  ✓ Found {len(result['outline'])} headings\n"
+              f"  ✓ Output: {output_file.name}")
     
     total_time = time.time() - total_start_time
     print(f"\n=== Processing Complete ===")
@@ -422,4 +577,4 @@ def process_pdfs():
     print(f"Processed {len(pdf_files)} files successfully")
 
 if __name__ == "__main__":
-    process_pdfs()
+    process_pdfs(force="--force" in sys.argv[1:], verbose="--quiet" not in sys.argv[1:])
@@ -7,12 +7,16 @@ import sys
 from pathlib import Path
 
 # Import the main script components
-from process_pdfs import FastPDFHeadingExtractor
+from process_pdfs import extract_all, list_pdfs, pending_pdfs, write_json
 import json
 import time
 
-def run_with_custom_paths(input_dir, output_dir):
-    """Run PDF processing with custom input/output directories"""
+def run_with_custom_paths(input_dir, output_dir, incremental=False, verbose=True):
+    """
+    Run PDF processing with custom input/output directories
+    
+    Every PDF is reprocessed unless incremental is set, which skips up-to-date outputs.
+    """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     
@@ -22,39 +26,44 @@ def run_with_custom_paths(input_dir, output_dir):
     # Ensure output directory exists
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Initialize extractor
-    extractor = FastPDFHeadingExtractor()
-    
     # Get all PDF files
-    pdf_files = list(input_path.glob("*.pdf"))
+    pdf_files = list_pdfs(input_path)
     
     if not pdf_files:
         print("No PDF files found in input directory")
         return
     
-    print(f"Found {len(pdf_files)} PDF files to process")
+    print(f"Found {len(pdf_files)} PDF files")
+    
+    skipped = len(pdf_files)
+    pdf_files = pending_pdfs(pdf_files, output_path, force=not incremental)
+    skipped -= len(pdf_files)
+    if skipped:
+        print(f"Skipping {skipped} up-to-date files (drop --incremental to reprocess)")
+    if not pdf_files:
+        print("All outputs are up to date")
+        return
+    
+    print(f"Processing {len(pdf_files)} PDF files")
     
     total_start_time = time.time()
     
-    for pdf_file in pdf_files:
-        print(f"\nProcessing: {pdf_file.name}")
-        start_time = time.time()
-        
-        # Extract headings
-        result = extractor.extract_headings(str(pdf_file))
+    for pdf_path, result, processing_time in extract_all(pdf_files):
+        pdf_file = Path(pdf_path)
         
         # Create output filename
         output_file = output_path / f"{pdf_file.stem}.json"
         
         # Save result
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_json(output_file, result)
         
-        processing_time = time.time() - start_time
-        print(f"  ✓ Completed in {processing_time:.3f}s")
-        print(f"  ✓ Title: {result.get('title', 'None')}")
-        print(f"  ✓ Found {len(result['outline'])} headings")
-        print(f"  ✓ Output: {output_file.name}")
+        if not verbose:
+            continue
+        print(f"\nProcessing: {pdf_file.name}\n"
+              f"  ✓ Completed in {processing_time:.3f}s\n"
+              f"  ✓ Title: {result.get('title', 'None')}\n"
+              f"  ✓ Found {len(result['outline'])} headings\n"
+              f"  ✓ Output: {output_file.name}")
     
     total_time = time.time() - total_start_time
     print(f"\n=== Processing Complete ===")
@@ -64,7 +73,10 @@ def run_with_custom_paths(input_dir, output_dir):
 
 if __name__ == "__main__":
     # Use command line arguments or defaults
-    input_dir = sys.argv[1] if len(sys.argv) > 1 else "sample_dataset/pdfs"
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else "sample_dataset/outputs"
+    incremental = "--incremental" in sys.argv[1:]
+    verbose = "--quiet" not in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg not in ("--incremental", "--quiet")]
+    input_dir = args[0] if len(args) > 0 else "sample_dataset/pdfs"
+    output_dir = args[1] if len(args) > 1 else "sample_dataset/outputs"
     
-    run_with_custom_paths(input_dir, output_dir)
+    run_with_custom_paths(input_dir, output_dir, incremental, verbose)
@@ -7,15 +7,19 @@ extracts relevant content based on specific personas and use cases.
 Adobe India Hackathon 2025
 """
 
+import gc
+import hashlib
+import heapq
 import os
 import sys
 import json
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, NamedTuple, Iterator
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 # Import PDF processing capabilities from Challenge 1a
 try:
@@ -24,6 +28,98 @@ except ImportError:
     print("Error: PyMuPDF not installed. Install with: pip install PyMuPDF")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+# Generic labels that look like headings but never title a section
+_GENERIC_LABELS = frozenset({
+    'note:', 'tip:', 'important:', 'warning:', 'example:', 'note', 'tip', 'important', 'warning'
+})
+
+# Word tokens of lowercase text, for whole-word keyword matching
+_RE_TOKEN = re.compile(r"[a-z][a-z\-]+")
+
+# Sentence pieces between periods
+_RE_SENTENCE = re.compile(r'[^.]+')
+
+# Markers of list items or step-by-step detail in a sentence
+_RE_DETAIL_MARKERS = re.compile(r':|•|-|step|how|what|where|when')
+
+# Text extraction flags: default "dict" output minus embedded images
+_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# PyMuPDF span flag bit for bold text
+_BOLD_FLAG = 1 << 4
+
+# Fallback for fonts whose bold weight is only named, not flagged
+_RE_BOLD_FONT = re.compile(r'bold', re.I)
+
+def load_json(path: Path) -> Any:
+    """Read a UTF-8 JSON file, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_json(path: Path, data: Any) -> None:
+    """Write indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+# On-disk cache of extracted text blocks as JSON rows, keyed by PDF content
+# hash and the extraction settings. The settings (flags, bold test, PyMuPDF
+# version) are part of the key, so changing any of them misses the cache;
+# bump TEXT_CACHE_VERSION only when the extraction code itself changes.
+TEXT_CACHE_DIR = Path(os.environ.get("PDFEXTRACTOR_CACHE_DIR", Path.home() / ".cache" / "pdfextractor"))
+TEXT_CACHE_VERSION = 3
+
+def _text_cache_path(pdf_bytes: bytes, max_pages: int) -> Path:
+    """Cache file for a PDF's extracted text blocks (first max_pages pages)"""
+    digest = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+    settings = repr((TEXT_CACHE_VERSION, max_pages, _TEXT_FLAGS, _RE_BOLD_FONT.pattern, fitz.version[:2]))
+    settings_digest = hashlib.blake2b(settings.encode(), digest_size=8).hexdigest()
+    return TEXT_CACHE_DIR / f"{digest}-{settings_digest}.json"
+
+def _read_text_cache(cache_file: Path) -> List["TextBlock"]:
+    """Load text blocks stored by _write_text_cache"""
+    with open(cache_file, 'rb') as f:
+        data = f.read()
+    rows = orjson.loads(data) if orjson is not None else json.loads(data)
+    return [TextBlock(text, page, font_size, font_name, is_bold, tuple(bbox))
+            for text, page, font_size, font_name, is_bold, bbox in rows]
+
+def _write_text_cache(cache_file: Path, text_blocks: List["TextBlock"]) -> None:
+    """Store text blocks as JSON rows; a failed write only costs a re-parse later"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        rows = [tuple(block) for block in text_blocks]
+        if orjson is not None:
+            data = orjson.dumps(rows)
+        else:
+            data = json.dumps(rows, ensure_ascii=False).encode('utf-8')
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: could not write text cache {cache_file}: {e}")
+
+class TextBlock(NamedTuple):
+    """Text span with its structural information (one per extracted span)"""
+    text: str
+    page: int
+    font_size: float
+    font_name: str
+    is_bold: bool
+    bbox: Tuple[float, float, float, float]
+
 @dataclass
 class DocumentInfo:
     """Document information structure"""
@@ -61,13 +157,75 @@ class Challenge1bOutput:
     extracted_sections: List[Dict[str, Any]]
     subsection_analysis: List[Dict[str, Any]]
 
+class KeywordScanner:
+    """
+    Weighted keyword matcher over lowercase text. Presence checks match keywords
+    anywhere in the text ('meat' flags 'meatballs'); occurrence counts match a
+    whole word or its plural ('form' counts 'forms' but 'bus' never counts
+    'business'), with multi-word keywords matching runs of consecutive words.
+    """
+    
+    def __init__(self, weighted_keywords):
+        """Build from (keyword, weight) pairs; weights of repeated keywords add up"""
+        self.weights: Dict[str, int] = {}
+        for keyword, weight in weighted_keywords:
+            self.weights[keyword] = self.weights.get(keyword, 0) + weight
+        
+        # Keyword weights by token sequence, grouped by token count
+        # (single-token keywords keyed by the token itself); keywords that
+        # tokenize alike, such as 'menu' and 'menu,', share one summed weight
+        self._token_weights: Dict[int, Dict[Any, int]] = {}
+        # Plural word forms -> keyword token
+        self._forms: Dict[str, str] = {}
+        keyword_tokens = set()
+        for keyword, weight in self.weights.items():
+            tokens = tuple(_RE_TOKEN.findall(keyword))
+            if not tokens:
+                continue
+            key = tokens[0] if len(tokens) == 1 else tokens
+            token_weights = self._token_weights.setdefault(len(tokens), {})
+            token_weights[key] = token_weights.get(key, 0) + weight
+            keyword_tokens.update(tokens)
+        
+        for token in keyword_tokens:
+            self._forms[token + 's'] = token
+            self._forms[token + 'es'] = token
+            if token.endswith('y'):
+                self._forms[token[:-1] + 'ies'] = token
+        for token in keyword_tokens:  # a keyword always stands for itself
+            self._forms[token] = token
+    
+    def present(self, text: str) -> set:
+        """Keywords occurring anywhere in text"""
+        return {keyword for keyword in self.weights if keyword in text}
+    
+    def presence_score(self, text: str) -> int:
+        """Sum of weights of the distinct keywords occurring anywhere in text"""
+        return sum(weight for keyword, weight in self.weights.items() if keyword in text)
+    
+    def count_score(self, text: str) -> int:
+        """Sum of weight * whole-word occurrences per keyword in text"""
+        forms = self._forms
+        tokens = [forms.get(token, token) for token in _RE_TOKEN.findall(text)]
+        score = 0
+        for size, token_weights in self._token_weights.items():
+            if size == 1:
+                counts = Counter(tokens)
+            else:
+                counts = Counter(zip(*(tokens[i:] for i in range(size))))
+            for key, weight in token_weights.items():
+                score += weight * counts[key]
+        return score
+
 class PersonaBasedAnalyzer:
     """
     Advanced PDF analyzer that processes documents based on specific personas and tasks
     """
     
-    def __init__(self):
-        """Initialize the persona-based analyzer"""
+    def __init__(self, max_pages: int = 50):
+        """Initialize the persona-based analyzer; only the first max_pages pages of each PDF are read"""
+        self.max_pages = max_pages
+        
         self.travel_keywords = [
             'itinerary', 'accommodation', 'hotel', 'restaurant', 'attraction', 'tour',
             'transport', 'flight', 'train', 'bus', 'guide', 'booking', 'reservation',
@@ -92,73 +250,133 @@ class PersonaBasedAnalyzer:
             'catering', 'dinner', 'lunch', 'breakfast', 'food', 'cuisine', 'dietary',
             'allergen', 'nutrition', 'quantity', 'scale', 'cooking', 'kitchen'
         ]
-    
-    def _get_persona_keywords(self, persona: str) -> List[str]:
-        """Get keywords for specific persona"""
-        keyword_map = {
+        
+        self._persona_keywords = {
             "Travel Planner": self.travel_keywords,
             "HR Professional": self.hr_keywords, 
             "Food Contractor": self.food_keywords
         }
-        return keyword_map.get(persona, [])
+        
+        self.non_veg_keywords = ['chicken', 'beef', 'pork', 'fish', 'meat', 'sausage', 'bacon', 'shrimp']
+        
+        # One scanner per keyword set, built once and reused for every text
+        self._persona_scanners = {
+            persona: KeywordScanner((keyword, 1) for keyword in self._get_persona_keywords(persona))
+            for persona in ("Travel Planner", "HR Professional", "Food Contractor")
+        }
+        self._task_scanners = {
+            # For vegetarian buffet task: bonus for vegetarian/vegan, gluten-free and
+            # buffet/corporate content, heavy penalty for non-vegetarian content
+            "Food Contractor": KeywordScanner(
+                [(keyword, 5) for keyword in ['vegetarian', 'vegan', 'plant-based', 'veggie', 'tofu', 'beans', 'lentils', 'quinoa', 'chickpeas']] +
+                [(keyword, 3) for keyword in ['gluten-free', 'gluten free', 'rice', 'quinoa', 'corn']] +
+                [(keyword, 2) for keyword in ['buffet', 'serving', 'corporate', 'large', 'group', 'catering', 'party']] +
+                [(keyword, -10) for keyword in self.non_veg_keywords]
+            ),
+            # For group travel planning
+            "Travel Planner": KeywordScanner(
+                [(keyword, 3) for keyword in ['group', 'friends', 'college', 'budget', 'affordable', 'young']] +
+                [(keyword, 2) for keyword in ['activity', 'attraction', 'tour', 'visit', 'explore', 'experience']]
+            ),
+            # For form management
+            "HR Professional": KeywordScanner(
+                (keyword, 3) for keyword in ['form', 'fillable', 'onboarding', 'compliance', 'employee', 'workflow']
+            ),
+        }
+        self._non_veg_scanner = KeywordScanner((keyword, 1) for keyword in self.non_veg_keywords)
+        # Bonus for vegetarian/buffet-specific content
+        self._veg_bonus_scanner = KeywordScanner(
+            (keyword, 4) for keyword in ['vegetarian', 'vegan', 'gluten-free', 'buffet', 'serving', 'corporate']
+        )
+    
+    def _get_persona_keywords(self, persona: str) -> List[str]:
+        """Get keywords for specific persona"""
+        return self._persona_keywords.get(persona, [])
+    
+    def _get_persona_scanner(self, persona: str) -> KeywordScanner:
+        """Get the keyword scanner for specific persona"""
+        return self._persona_scanners.get(persona) or KeywordScanner([])
     
-    def extract_text_with_structure(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """Extract text with structural information from PDF"""
+    def extract_text_with_structure(self, pdf_path: str, force_refresh: bool = False) -> List[TextBlock]:
+        """
+        Extract text with structural information from PDF
+        
+        Results are cached on disk by PDF content hash; force_refresh re-parses the PDF.
+        """
+        cache_file = None
+        pdf_bytes = None
+        try:
+            # Read the file once: the bytes key the cache and feed MuPDF
+            pdf_bytes = Path(pdf_path).read_bytes()
+            cache_file = _text_cache_path(pdf_bytes, self.max_pages)
+            if not force_refresh and cache_file.exists():
+                return _read_text_cache(cache_file)
+        except Exception as e:
+            print(f"Warning: ignoring text cache for {pdf_path}: {e}")
+        
         text_blocks = []
         
         try:
-            doc = fitz.open(pdf_path)
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                blocks = page.get_text("dict")["blocks"]
-                
-                for block in blocks:
-                    if "lines" not in block:
-                        continue
+            if pdf_bytes is None:
+                doc = fitz.open(pdf_path)
+            else:
+                doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            with doc:
+                for page in doc.pages(0, min(len(doc), self.max_pages)):
+                    page_num = page.number
+                    blocks = page.get_text("dict", flags=_TEXT_FLAGS)["blocks"]
                     
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text = span["text"].strip()
-                            if len(text) < 3:
-                                continue
+                    for block in blocks:
+                        if "lines" not in block:
+                            continue
+                        
+                        for line in block["lines"]:
+                            for span in line["spans"]:
+                                text = span["text"].strip()
+                                if len(text) < 3:
+                                    continue
                                 
-                            text_blocks.append({
-                                "text": text,
-                                "page": page_num + 1,
-                                "font_size": span["size"],
-                                "font_name": span["font"],
-                                "is_bold": "bold" in span["font"].lower() or span["flags"] & 2**4,
-                                "bbox": span["bbox"]
-                            })
-            
-            doc.close()
-            
+                                # Font names repeat across every span; intern them once
+                                font = sys.intern(span["font"])
+                                    
+                                text_blocks.append(TextBlock(
+                                    text,
+                                    page_num + 1,
+                                    span["size"],
+                                    font,
+                                    bool(span["flags"] & _BOLD_FLAG) or bool(_RE_BOLD_FONT.search(font)),
+                                    span["bbox"]
+                                ))
         except Exception as e:
             print(f"Error extracting text from {pdf_path}: {e}")
+            cache_file = None  # never cache a partial extraction
+        finally:
+            # Drop MuPDF's cached resources for this document
+            fitz.TOOLS.store_shrink(100)
+        
+        if cache_file is not None:
+            _write_text_cache(cache_file, text_blocks)
         
         return text_blocks
     
-    def identify_sections(self, text_blocks: List[Dict[str, Any]], persona: str) -> List[Dict[str, Any]]:
+    def identify_sections(self, text_blocks: List[TextBlock], persona: str) -> List[Dict[str, Any]]:
         """Identify relevant sections based on persona with improved filtering"""
         sections = []
         
-        # Get persona-specific keywords
-        keywords = self._get_persona_keywords(persona)
-        
         # Group text blocks by potential sections with stricter criteria
         potential_sections = []
         current_section = None
         
         for block in text_blocks:
-            text = block["text"].strip()
+            text = block.text.strip()
             
             # Improved heading detection with balanced criteria
+            # (cheap field checks first; text is already stripped, so only lower() it)
             is_proper_heading = (
-                block["is_bold"] and 
-                block["font_size"] > 11 and  # Lower threshold
+                block.is_bold and 
+                block.font_size > 11 and  # Lower threshold
                 5 <= len(text) <= 120 and  # Wider range
-                not text.lower().strip() in ['note:', 'tip:', 'important:', 'warning:', 'example:', 'note', 'tip', 'important', 'warning']  # Avoid only the most generic labels
+                text.lower() not in _GENERIC_LABELS  # Avoid only the most generic labels
             )
             
             if is_proper_heading:
@@ -167,31 +385,26 @@ class PersonaBasedAnalyzer:
                 
                 current_section = {
                     "title": text,
-                    "page": block["page"],
-                    "content": [block["text"]],
+                    "page": block.page,
+                    "content": [block.text],
                     "importance_score": 0
                 }
             elif current_section:
-                current_section["content"].append(block["text"])
+                current_section["content"].append(block.text)
         
         if current_section:
             potential_sections.append(current_section)
         
         # Score sections based on persona relevance
-        relevant_keywords = self._get_persona_keywords(persona)
+        scanner = self._get_persona_scanner(persona)
         
         for section in potential_sections:
             section_text = " ".join(section["content"]).lower()
             title_text = section["title"].lower()
             
-            # Calculate importance score with better weighting
-            score = 0
-            for keyword in relevant_keywords:
-                title_matches = title_text.count(keyword)
-                content_matches = section_text.count(keyword)
-                
-                score += title_matches * 5  # Title matches are much more important
-                score += content_matches * 1
+            # Calculate importance score with better weighting:
+            # title matches are much more important than content matches
+            score = scanner.count_score(title_text) * 5 + scanner.count_score(section_text)
                 
             # Bonus for proper section structure
             if ':' in section["title"]:
@@ -205,11 +418,9 @@ class PersonaBasedAnalyzer:
             if score >= 1:  # Lower threshold for inclusion
                 sections.append(section)
         
-        # Sort by importance score (descending) and limit results
-        sections.sort(key=lambda x: x["importance_score"], reverse=True)
-        
-        # Limit to top 15 most relevant sections per collection
-        return sections[:15]
+        # Limit to top 15 most relevant sections per collection, by importance
+        # score (descending); nlargest keeps sort order without a full sort
+        return heapq.nlargest(15, sections, key=lambda x: x["importance_score"])
     
     def analyze_subsections(self, sections: List[Dict[str, Any]], persona: str, task: str) -> List[Dict[str, Any]]:
         """Analyze and refine subsections based on the specific task"""
@@ -219,26 +430,24 @@ class PersonaBasedAnalyzer:
         task_scored_sections = []
         
         for section in sections[:8]:  # Limit to top 8 sections for cleaner output
-            content_text = " ".join(section["content"])
-            
-            # Calculate task-specific score for better sorting
-            task_score = self._calculate_task_relevance(content_text, persona, task)
+            # Task-specific score for better sorting
+            task_score = self._calculate_task_relevance(" ".join(section["content"]), persona, task)
             task_scored_sections.append((section, task_score))
         
         # Sort by task relevance (higher scores first)
         task_scored_sections.sort(key=lambda x: x[1], reverse=True)
         
         # Process sections in order of task relevance, ensuring document diversity
-        document_count = {}  # Track how many sections we've taken from each document
+        document_count = Counter()  # Track how many sections we've taken from each document
         max_per_document = 3  # Limit sections per document to ensure diversity
         
         for section, task_score in task_scored_sections:
             document = section.get("document", "")
             
             # Skip if we've already taken too many from this document
-            if document_count.get(document, 0) >= max_per_document:
+            if document_count[document] >= max_per_document:
                 continue
-                
+            
             content_text = " ".join(section["content"])
             
             # Extract key information based on persona and task
@@ -252,7 +461,7 @@ class PersonaBasedAnalyzer:
                 })
                 
                 # Update document count
-                document_count[document] = document_count.get(document, 0) + 1
+                document_count[document] += 1
                 
                 # Stop if we have enough analyses
                 if len(subsection_analysis) >= 8:
@@ -263,77 +472,33 @@ class PersonaBasedAnalyzer:
     def _calculate_task_relevance(self, text: str, persona: str, task: str) -> int:
         """Calculate how relevant text is to the specific task"""
         text_lower = text.lower()
-        task_lower = task.lower()
         score = 0
         
         # Task-specific scoring
-        if persona == "Food Contractor":
-            # For vegetarian buffet task
-            vegetarian_keywords = ['vegetarian', 'vegan', 'plant-based', 'veggie', 'tofu', 'beans', 'lentils', 'quinoa', 'chickpeas']
-            gluten_free_keywords = ['gluten-free', 'gluten free', 'rice', 'quinoa', 'corn']
-            buffet_keywords = ['buffet', 'serving', 'corporate', 'large', 'group', 'catering', 'party']
-            non_veg_keywords = ['chicken', 'beef', 'pork', 'fish', 'meat', 'sausage', 'bacon', 'shrimp']
-            
-            # Bonus for vegetarian/vegan content
-            for keyword in vegetarian_keywords:
-                if keyword in text_lower:
-                    score += 5
-            
-            # Bonus for gluten-free content  
-            for keyword in gluten_free_keywords:
-                if keyword in text_lower:
-                    score += 3
-                    
-            # Bonus for buffet/corporate content
-            for keyword in buffet_keywords:
-                if keyword in text_lower:
-                    score += 2
-            
-            # Penalty for non-vegetarian content
-            for keyword in non_veg_keywords:
-                if keyword in text_lower:
-                    score -= 10  # Heavy penalty
-        
-        elif persona == "Travel Planner":
-            # For group travel planning
-            group_keywords = ['group', 'friends', 'college', 'budget', 'affordable', 'young']
-            activity_keywords = ['activity', 'attraction', 'tour', 'visit', 'explore', 'experience']
-            
-            for keyword in group_keywords:
-                if keyword in text_lower:
-                    score += 3
-                    
-            for keyword in activity_keywords:
-                if keyword in text_lower:
-                    score += 2
-        
-        elif persona == "HR Professional":
-            # For form management
-            form_keywords = ['form', 'fillable', 'onboarding', 'compliance', 'employee', 'workflow']
-            for keyword in form_keywords:
-                if keyword in text_lower:
-                    score += 3
+        scanner = self._task_scanners.get(persona)
+        if scanner is not None:
+            score += scanner.presence_score(text_lower)
         
         return max(score, 0)  # Don't allow negative scores
     
     def refine_text_for_persona(self, text: str, persona: str, task: str) -> str:
         """Refine text content based on persona and specific task"""
         # Extract relevant sentences based on persona with better filtering
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
+        # (lazily: the same pieces as text.split('.'), stripped, empty ones skipped)
+        sentences = (s for s in map(str.strip, _RE_SENTENCE.findall(text)) if s)
         relevant_sentences = []
         
-        relevant_keywords = self._get_persona_keywords(persona)
-        task_keywords = [word.lower() for word in task.split() if len(word) > 3]
+        persona_scanner = self._get_persona_scanner(persona)
+        task_scanner = KeywordScanner((word.lower(), 3) for word in task.split() if len(word) > 3)
         
         # Special filtering for Food Contractor persona - prefer vegetarian but don't completely exclude
         if persona == "Food Contractor" and "vegetarian" in task.lower():
             # Prioritize vegetarian content but still include some non-vegetarian for adaptation ideas
             vegetarian_sentences = []
             other_sentences = []
-            non_veg_keywords = ['chicken', 'beef', 'pork', 'fish', 'meat', 'sausage', 'bacon', 'shrimp']
             
             for sentence in sentences:
-                if any(nv_keyword in sentence.lower() for nv_keyword in non_veg_keywords):
+                if self._non_veg_scanner.present(sentence.lower()):
                     other_sentences.append(sentence)
                 else:
                     vegetarian_sentences.append(sentence)
@@ -349,47 +514,42 @@ class PersonaBasedAnalyzer:
             relevance_score = 0
             
             # Score based on keyword presence with better weighting
-            for keyword in relevant_keywords:
-                if keyword in sentence_lower:
-                    relevance_score += 2
+            relevance_score += persona_scanner.presence_score(sentence_lower) * 2
             
             # Higher boost for task-specific keywords
-            for keyword in task_keywords:
-                if keyword in sentence_lower:
-                    relevance_score += 3
+            relevance_score += task_scanner.presence_score(sentence_lower)
             
             # Additional scoring for specific personas
             if persona == "Food Contractor":
-                # Bonus for vegetarian/buffet-specific content
-                veg_bonus_keywords = ['vegetarian', 'vegan', 'gluten-free', 'buffet', 'serving', 'corporate']
-                for keyword in veg_bonus_keywords:
-                    if keyword in sentence_lower:
-                        relevance_score += 4
+                relevance_score += self._veg_bonus_scanner.presence_score(sentence_lower)
             
             # Bonus for sentences with numbers, lists, or specific details
             if any(char.isdigit() for char in sentence):
                 relevance_score += 1
-            if any(word in sentence_lower for word in [':', '•', '-', 'step', 'how', 'what', 'where', 'when']):
+            if _RE_DETAIL_MARKERS.search(sentence_lower):
                 relevance_score += 1
             
             if relevance_score >= 1:  # Lower threshold to include more content
-                relevant_sentences.append((sentence, relevance_score))
+                # Position breaks score ties so equal scores keep document order
+                relevant_sentences.append((-relevance_score, len(relevant_sentences), sentence))
         
-        # Sort by relevance and take top sentences, ensuring good length
-        relevant_sentences.sort(key=lambda x: x[1], reverse=True)
+        # Take top sentences by relevance, ensuring good length; the heap
+        # yields them best-first without sorting every candidate
+        heapq.heapify(relevant_sentences)
         
         # Build refined text with good structure
         selected_sentences = []
         total_length = 0
         
-        for sentence, score in relevant_sentences:
-            if total_length + len(sentence) < 500 and len(selected_sentences) < 4:  # Limit length and count
+        while relevant_sentences and len(selected_sentences) < 4:  # Limit count
+            _, _, sentence = heapq.heappop(relevant_sentences)
+            if total_length + len(sentence) < 500:  # Limit length
                 selected_sentences.append(sentence)
                 total_length += len(sentence)
         
         return '. '.join(selected_sentences) + '.' if selected_sentences else ""
     
-    def process_collection(self, collection_path: Path) -> Dict[str, Any]:
+    def process_collection(self, collection_path: Path, force_refresh: bool = False) -> Dict[str, Any]:
         """Process a single collection"""
         print(f"\nProcessing collection: {collection_path.name}")
         
@@ -400,8 +560,7 @@ class PersonaBasedAnalyzer:
             return None
         
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                input_data = json.load(f)
+            input_data = load_json(input_file)
         except Exception as e:
             print(f"Error loading input file: {e}")
             return None
@@ -428,6 +587,13 @@ class PersonaBasedAnalyzer:
         
         pdfs_dir = collection_path / "PDFs"
         
+        # List the PDFs directory once instead of a stat() per document
+        try:
+            with os.scandir(pdfs_dir) as entries:
+                available = {entry.name for entry in entries}
+        except OSError:
+            available = set()
+        
         # Process each document and collect all sections
         all_sections_with_scores = []
         
@@ -435,27 +601,25 @@ class PersonaBasedAnalyzer:
             filename = doc_info.get("filename", "")
             title = doc_info.get("title", "")
             
-            pdf_path = pdfs_dir / filename
-            
-            if not pdf_path.exists():
+            if filename not in available:
                 print(f"    Warning: PDF not found: {filename}")
                 continue
             
             print(f"    Processing: {filename}")
             processed_documents.append(filename)
-            
-            # Extract text and identify sections
-            text_blocks = self.extract_text_with_structure(str(pdf_path))
-            sections = self.identify_sections(text_blocks, persona_role)
-            
+        
+        # Extract text and identify sections for each PDF in parallel;
+        # map() keeps results in document order
+        pdf_paths = [str(pdfs_dir / filename) for filename in processed_documents]
+        results = extract_all(self, pdf_paths, persona_role, force_refresh)
+        for filename, sections in zip(processed_documents, results):
             # Add document info to each section
             for section in sections:
                 section["document"] = filename
                 all_sections_with_scores.append(section)
         
         # Sort all sections globally by importance score and take top 12
-        all_sections_with_scores.sort(key=lambda x: x["importance_score"], reverse=True)
-        top_sections = all_sections_with_scores[:12]
+        top_sections = heapq.nlargest(12, all_sections_with_scores, key=lambda x: x["importance_score"])
         
         # Create extracted sections with importance ranking
         for idx, section in enumerate(top_sections):
@@ -482,10 +646,54 @@ class PersonaBasedAnalyzer:
             subsection_analysis=all_subsection_analysis
         )
         
-        return asdict(output)
+        # Shallow conversion: the fields already hold plain dicts and lists,
+        # so asdict()'s recursive copy would only duplicate them
+        return {field.name: getattr(output, field.name) for field in fields(output)}
+
+# Upper bound on parallel PDF workers (each holds its own MuPDF store)
+MAX_WORKERS = 4
 
-def process_challenge_1b():
-    """Main processing function for Challenge 1b"""
+# Analyzer owned by the current pool worker, set by _init_worker()
+_WORKER_ANALYZER: Optional[PersonaBasedAnalyzer] = None
+
+def _init_worker(analyzer: PersonaBasedAnalyzer) -> None:
+    """Pool initializer: keep one analyzer per worker process"""
+    global _WORKER_ANALYZER
+    _WORKER_ANALYZER = analyzer
+
+def _extract_and_score(pdf_path: str, persona: str, force_refresh: bool = False) -> List[Dict[str, Any]]:
+    """Extract text from one PDF and identify its sections; runs inside a pool worker"""
+    analyzer = _WORKER_ANALYZER or PersonaBasedAnalyzer()
+    text_blocks = analyzer.extract_text_with_structure(pdf_path, force_refresh)
+    return analyzer.identify_sections(text_blocks, persona)
+
+def worker_count(num_files: int) -> int:
+    """Number of pool workers to use for a collection's PDFs"""
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS, num_files))
+
+def extract_all(analyzer: PersonaBasedAnalyzer, pdf_paths: List[str], persona: str,
+                force_refresh: bool = False) -> Iterator[List[Dict[str, Any]]]:
+    """Yield _extract_and_score results in input order, skipping the pool when one worker would do"""
+    if not pdf_paths:
+        return
+    args = (pdf_paths, [persona] * len(pdf_paths), [force_refresh] * len(pdf_paths))
+    workers = worker_count(len(pdf_paths))
+    if workers == 1:
+        # A single PDF (or CPU) gains nothing from starting a worker
+        _init_worker(analyzer)
+        yield from map(_extract_and_score, *args)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(analyzer,)) as executor:
+        yield from executor.map(_extract_and_score, *args)
+
+def process_challenge_1b(force: bool = False):
+    """
+    Main processing function for Challenge 1b
+    
+    With force set, PDFs are re-parsed instead of read from the text cache.
+    """
     print("=== Challenge 1b: Multi-Collection PDF Analysis ===")
     
     # Get the Challenge_1b directory
@@ -509,26 +717,29 @@ def process_challenge_1b():
         start_time = time.time()
         
         # Process the collection
-        result = analyzer.process_collection(collection_path)
+        result = analyzer.process_collection(collection_path, force_refresh=force)
         
         if result:
             # Save output
             output_file = collection_path / "challenge1b_output.json"
             
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
+                save_json(output_file, result)
                 
                 processing_time = time.time() - start_time
-                print(f"  ✓ Completed in {processing_time:.3f}s")
-                print(f"  ✓ Extracted sections: {len(result.get('extracted_sections', []))}")
-                print(f"  ✓ Subsection analyses: {len(result.get('subsection_analysis', []))}")
-                print(f"  ✓ Output saved: {output_file.name}")
+                print(f"  ✓ Completed in {processing_time:.3f}s\n"
+                      f"  ✓ Extracted sections: {len(result.get('extracted_sections', []))}\n"
+                      f"  ✓ Subsection analyses: {len(result.get('subsection_analysis', []))}\n"
+                      f"  ✓ Output saved: {output_file.name}")
                 
             except Exception as e:
                 print(f"  ✗ Error saving output: {e}")
         else:
             print(f"  ✗ Failed to process {collection_name}")
+        
+        # Release cached PDF resources before the next collection
+        fitz.TOOLS.store_shrink(100)
+        gc.collect()
     
     total_time = time.time() - total_start_time
     print(f"\n=== Processing Complete ===")
@@ -536,4 +747,4 @@ def process_challenge_1b():
     print(f"All collections processed successfully!")
 
 if __name__ == "__main__":
-    process_challenge_1b()
+    process_challenge_1b(force="--force" in sys.argv[1:])
@@ -5,13 +5,31 @@ Validation script for Challenge 1b outputs
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+# Required keys of the output schema, checked in this (reporting) order
+REQUIRED_KEYS = ('metadata', 'extracted_sections', 'subsection_analysis')
+METADATA_KEYS = ('input_documents', 'persona', 'job_to_be_done')
+SECTION_KEYS = ('document', 'section_title', 'importance_rank', 'page_number')
+SUBSECTION_KEYS = ('document', 'refined_text', 'page_number')
+
+def first_missing_key(entries: list, keys: tuple):
+    """First required key absent from any entry, or None if every entry has them all"""
+    required = frozenset(keys)
+    for entry in entries:
+        if not entry.keys() >= required:
+            return next(key for key in keys if key not in entry)
+    return None
+
 def validate_output_structure(output_data: dict, collection_name: str) -> bool:
     """Validate the output JSON structure"""
     print(f"\nValidating {collection_name}:")
     
     # Check required top-level keys
-    required_keys = ['metadata', 'extracted_sections', 'subsection_analysis']
-    for key in required_keys:
+    for key in REQUIRED_KEYS:
         if key not in output_data:
             print(f"  ❌ Missing required key: {key}")
             return False
@@ -19,8 +37,7 @@ def validate_output_structure(output_data: dict, collection_name: str) -> bool:
     
     # Check metadata structure
     metadata = output_data['metadata']
-    metadata_keys = ['input_documents', 'persona', 'job_to_be_done']
-    for key in metadata_keys:
+    for key in METADATA_KEYS:
         if key not in metadata:
             print(f"  ❌ Missing metadata key: {key}")
             return False
@@ -33,11 +50,10 @@ def validate_output_structure(output_data: dict, collection_name: str) -> bool:
         return False
     
     if sections:
-        section_keys = ['document', 'section_title', 'importance_rank', 'page_number']
-        for key in section_keys:
-            if key not in sections[0]:
-                print(f"  ❌ Missing section key: {key}")
-                return False
+        missing = first_missing_key(sections, SECTION_KEYS)
+        if missing is not None:
+            print(f"  ❌ Missing section key: {missing}")
+            return False
         print(f"  ✅ Extracted {len(sections)} sections with correct structure")
     
     # Check subsection analysis structure  
@@ -47,11 +63,10 @@ def validate_output_structure(output_data: dict, collection_name: str) -> bool:
         return False
     
     if subsections:
-        subsection_keys = ['document', 'refined_text', 'page_number']
-        for key in subsection_keys:
-            if key not in subsections[0]:
-                print(f"  ❌ Missing subsection key: {key}")
-                return False
+        missing = first_missing_key(subsections, SUBSECTION_KEYS)
+        if missing is not None:
+            print(f"  ❌ Missing subsection key: {missing}")
+            return False
         print(f"  ✅ Analyzed {len(subsections)} subsections with correct structure")
     
     print(f"  ✅ {collection_name} validation passed!")
@@ -75,8 +90,11 @@ def main():
             continue
         
         try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                output_data = json.load(f)
+            if orjson is not None:
+                output_data = orjson.loads(output_file.read_bytes())
+            else:
+                with open(output_file, 'r', encoding='utf-8') as f:
+                    output_data = json.load(f)
             
             if not validate_output_structure(output_data, collection):
                 all_valid = False